@@ -1,5 +1,8 @@
+import hashlib
 import logging
+import orjson
 import os
+import threading
 import time
 from openai import OpenAI
 
@@ -7,6 +10,51 @@ from openai import OpenAI
 logger = logging.getLogger('portfolio.ai_assistant')
 logger.setLevel(logging.INFO)
 
+# System prompt; only the repository context changes between portfolios
+SYSTEM_PROMPT_TEMPLATE = """You are an AI assistant that helps users understand Chigbu Joshua's portfolio projects.
+Use the following structured information about the GitHub repositories to answer questions.
+
+{context}
+
+When answering:
+1. Focus on the structured metadata, technology signatures, and demonstrated competencies
+2. Reference specific projects and their architecture patterns when relevant
+3. Highlight relationships between components in monorepo structures
+4. Organize your response with clear sections and bullet points
+5. Emphasize technical skills shown in the projects
+
+Respond specifically and accurately about the projects listed above.
+If asked about a specific technology, framework, or architecture pattern, check the metadata first before the general repository information.
+"""
+
+# Formatted system prompts keyed by a digest of the repository data
+MAX_CACHED_PROMPTS = 8
+_system_prompt_cache = {}
+_system_prompt_lock = threading.Lock()
+
+# Shared Groq client, created on first use so its connection pool
+# survives across queries in the same worker
+_groq_client = None
+
+def get_groq_client():
+    """Return the shared Groq client, creating it on first use."""
+    global _groq_client
+    if _groq_client is None:
+        # Get the Groq API key from environment variables
+        groq_api_key = os.getenv("GROQ_API_KEY")
+        
+        if not groq_api_key:
+            logger.error("GROQ_API_KEY not configured in environment")
+            raise ValueError("GROQ_API_KEY environment variable is not set")
+        
+        # The SDK retries 429/5xx itself with exponential backoff and honours Retry-After
+        _groq_client = OpenAI(
+            api_key=groq_api_key,
+            base_url="https://api.groq.com/openai/v1",
+            max_retries=4
+        )
+    return _groq_client
+
 # Keep the empty functions for backward compatibility, but make them redirect
 def extract_repo_metadata(repo_name, username, github_token):
     """
@@ -32,8 +80,7 @@ def generate_enhanced_context(filtered_repos):
     This function is kept for backward compatibility
     """
     from github_client import GitHubClient
-    client = GitHubClient()
-    return client.generate_enhanced_context(filtered_repos)
+    return GitHubClient.generate_enhanced_context(filtered_repos)
 
 def fetch_and_process_repos(username, github_token):
     """Fetch repositories and process them using the centralized GitHub client."""
@@ -54,78 +101,87 @@ def fetch_and_process_repos(username, github_token):
         logger.error(f"Error fetching processed repositories: {str(e)}", exc_info=True)
         raise
 
-def query_ai_assistant(query, repos_data):
-    """Query the AI assistant with repository data and user query."""
+def build_system_prompt(repos_data):
+    """Return the system prompt for repos_data, formatting it only on a cache miss."""
+    digest = hashlib.blake2b(
+        orjson.dumps(repos_data, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+    
+    with _system_prompt_lock:
+        system_message = _system_prompt_cache.get(digest)
+    if system_message is None:
+        from github_client import GitHubClient
+        context = GitHubClient.generate_enhanced_context(repos_data)
+        system_message = SYSTEM_PROMPT_TEMPLATE.format(context=context)
+        
+        # Drop the oldest prompt once the cache is full; request threads share the cache
+        with _system_prompt_lock:
+            if digest not in _system_prompt_cache and len(_system_prompt_cache) >= MAX_CACHED_PROMPTS:
+                _system_prompt_cache.pop(next(iter(_system_prompt_cache)))
+            _system_prompt_cache[digest] = system_message
+    else:
+        logger.debug("Reusing cached system prompt")
+        
+    return system_message
+
+def stream_ai_assistant(query, repos_data):
+    """Yield the AI assistant's answer in chunks as the model generates it."""
     logger.info("Starting AI assistant query")
     
     # Add tracing for request sequence
     request_id = f"req-{int(time.time())}"
     logger.info(f"Request ID: {request_id} - Processing query: {query[:100]}...")
     
-    # Generate enhanced context for the LLM
-    from github_client import GitHubClient
-    client = GitHubClient()
-    
-    context_start = time.time()
-    context = client.generate_enhanced_context(repos_data)
-    context_time = time.time() - context_start
-    logger.info(f"Request ID: {request_id} - Generated context in {context_time:.2f}s ({len(context)} chars)")
-    
-    # Get the Groq API key from environment variables
-    groq_api_key = os.getenv("GROQ_API_KEY")
-    
-    if not groq_api_key:
-        logger.error("GROQ_API_KEY not configured in environment")
-        raise ValueError("GROQ_API_KEY environment variable is not set")
-    
-    # Initialize Groq client
-    client = OpenAI(
-        api_key=groq_api_key,
-        base_url="https://api.groq.com/openai/v1"
-    )
-    
-    # Create system message with enhanced repository context
-    system_message = f"""You are an AI assistant that helps users understand Chigbu Joshua's portfolio projects.
-Use the following structured information about the GitHub repositories to answer questions.
-
-{context}
-
-When answering:
-1. Focus on the structured metadata, technology signatures, and demonstrated competencies
-2. Reference specific projects and their architecture patterns when relevant
-3. Highlight relationships between components in monorepo structures
-4. Organize your response with clear sections and bullet points
-5. Emphasize technical skills shown in the projects
-
-Respond specifically and accurately about the projects listed above.
-If asked about a specific technology, framework, or architecture pattern, check the metadata first before the general repository information.
-"""
+    # Generate enhanced context for the LLM, reusing it for unchanged repository data
+    context_start = time.perf_counter()
+    system_message = build_system_prompt(repos_data)
+    context_time = time.perf_counter() - context_start
+    logger.info(f"Request ID: {request_id} - Prepared system prompt in {context_time:.2f}s ({len(system_message)} chars)")
     
-    logger.info(f"Request ID: {request_id} - Created system prompt ({len(system_message)} chars)")
+    # Reuse the shared Groq client and its connection pool
+    client = get_groq_client()
     
-    # Call Groq API with Llama model
+    # Call Groq API with Llama model, streaming tokens as they are generated
     try:
-        api_start = time.time()
-        response = client.chat.completions.create(
+        api_start = time.perf_counter()
+        stream = client.chat.completions.create(
             model="llama3-70b-8192",
             messages=[
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": query}
             ],
             max_tokens=1024,
-            temperature=0.3
+            temperature=0.3,
+            stream=True
         )
-        api_time = time.time() - api_start
         
-        # Extract the response text
-        if response.choices and len(response.choices) > 0:
-            answer = response.choices[0].message.content
-            logger.info(f"Request ID: {request_id} - Received AI response in {api_time:.2f}s ({len(answer)} chars)")
-            return answer
-        else:
-            logger.error(f"Request ID: {request_id} - Empty response from AI API")
-            return "I'm sorry, I couldn't generate a response based on the portfolio information."
+        first_chunk_time = None
+        total_chars = 0
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                if first_chunk_time is None:
+                    first_chunk_time = time.perf_counter() - api_start
+                    logger.info(f"Request ID: {request_id} - First AI tokens after {first_chunk_time:.2f}s")
+                total_chars += len(content)
+                yield content
+        
+        api_time = time.perf_counter() - api_start
+        logger.info(f"Request ID: {request_id} - Received AI response in {api_time:.2f}s ({total_chars} chars)")
             
     except Exception as e:
         logger.error(f"Request ID: {request_id} - Error calling AI API: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def query_ai_assistant(query, repos_data):
+    """Query the AI assistant with repository data and user query."""
+    answer = "".join(stream_ai_assistant(query, repos_data))
+    
+    if not answer:
+        logger.error("Empty response from AI API")
+        return "I'm sorry, I couldn't generate a response based on the portfolio information."
+    
+    return answer
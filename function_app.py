@@ -1,14 +1,18 @@
-import json
+import functools
+import gzip
+import hashlib
+import itertools
 import logging
+import orjson
 import os
+import threading
+import time
 import azure.functions as func
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 
 # Import the GitHub client
-from github_client import GitHubClient
-
-# Import AI assistant functions
-from ai_assistant import query_ai_assistant
+from github_client import GitHubClient, is_token_exhausted, ping_github
 
 # Configure logging
 logger = logging.getLogger('portfolio.api')
@@ -16,39 +20,159 @@ logger.setLevel(logging.INFO)
 
 app = func.FunctionApp()
 
+# Portfolio owner's GitHub username
+GITHUB_USERNAME = 'yungryce'
+
+# Settings read once at worker startup
+GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+AZURE_STORAGE = os.getenv('AzureWebJobsStorage')
+
+# Bodies smaller than this are sent uncompressed; gzip overhead outweighs the saving
+COMPRESS_MIN_BYTES = 1024
+
+# Largest accepted portfolio query body; checked before parsing
+MAX_QUERY_BODY_BYTES = 32 * 1024
+
+# Browser caching for GitHub data responses; ETags make revalidation cheap
+CLIENT_CACHE_CONTROL = 'public, max-age=60'
+
+# CORS preflight headers; Max-Age lets browsers skip repeat preflights for a day
+_PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+    "Access-Control-Max-Age": "86400"
+}
+
+# GitHub tokens rotated across requests to multiply rate-limit headroom;
+# GITHUB_TOKENS is comma-separated, GITHUB_TOKEN remains supported
+GITHUB_TOKENS = [
+    token.strip()
+    for token in os.getenv('GITHUB_TOKENS', os.getenv('GITHUB_TOKEN', '')).split(',')
+    if token.strip()
+]
+_token_cycle = itertools.cycle(GITHUB_TOKENS)
+_token_lock = threading.Lock()
+
+def _pick_token(resource='core'):
+    """Return the next GitHub token in rotation, skipping ones whose quota for resource is exhausted."""
+    if not GITHUB_TOKENS:
+        return None
+    
+    with _token_lock:
+        for _ in range(len(GITHUB_TOKENS)):
+            token = next(_token_cycle)
+            if not is_token_exhausted(token, resource):
+                return token
+    
+    # Every token is exhausted; the client will wait for the reset
+    return token
+
+def _compressed(req, body):
+    """Gzip a response body when the client accepts it, returning (body, headers)."""
+    if len(body) < COMPRESS_MIN_BYTES or 'gzip' not in req.headers.get('Accept-Encoding', '').lower():
+        return body, {'Vary': 'Accept-Encoding'}
+    
+    return gzip.compress(body, compresslevel=4, mtime=0), {'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'}
+
+def _cacheable_response(req, body, mimetype):
+    """Build a 200 response carrying an ETag, or an empty 304 if the client's copy is current."""
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    
+    # Plain and gzipped bodies carry distinct ETags but the same content
+    client_etags = {tag.strip() for tag in req.headers.get('If-None-Match', '').split(',')}
+    for etag in (f'"{digest}"', f'"{digest}-gzip"'):
+        if etag in client_etags:
+            return func.HttpResponse(
+                status_code=304,
+                headers={'ETag': etag, 'Cache-Control': CLIENT_CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+            )
+    
+    body, headers = _compressed(req, body)
+    headers['ETag'] = f'"{digest}-gzip"' if headers.get('Content-Encoding') == 'gzip' else f'"{digest}"'
+    headers['Cache-Control'] = CLIENT_CACHE_CONTROL
+    return func.HttpResponse(body, status_code=200, headers=headers, mimetype=mimetype)
+
+@functools.lru_cache(maxsize=1)
+def _ai():
+    """Import the AI assistant on first use; the OpenAI SDK is slow to load on cold start."""
+    from ai_assistant import query_ai_assistant
+    return query_ai_assistant
+
+# Clients keyed by token, reused across invocations so their connection pool
+# and in-memory cache persist. Usernames come from anonymous routes, so they
+# are passed to each call rather than keyed on, keeping this bounded.
+_clients = {}
+
+def _get_client(token):
+    """Return the shared GitHubClient for a token."""
+    client = _clients.get(token)
+    if client is None:
+        client = _clients[token] = GitHubClient(token=token, username=GITHUB_USERNAME)
+    return client
+
+# Seconds a health probe result is reused, so frequent load balancer probes
+# don't each spend a GitHub API call
+HEALTH_CACHE_TTL = 30
+
+# Upper bound in seconds on the GitHub connectivity check
+HEALTH_CHECK_TIMEOUT = 2.0
+
+# Probe results keyed by name: (status, monotonic expiry)
+_health_cache = {}
+
+# Runs the GitHub probe so the health check can stop waiting at a hard deadline
+_health_executor = ThreadPoolExecutor(max_workers=1)
+
+def _github_health_status(github_token):
+    """Check GitHub API connectivity, reusing a recent result when available."""
+    cached = _health_cache.get('github')
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    
+    try:
+        # Single attempt on a dedicated session; a slow upstream must not stall the probe.
+        # No GitHubClient is built here, as that would touch Blob Storage on a cold worker.
+        probe = _health_executor.submit(ping_github, github_token, HEALTH_CHECK_TIMEOUT)
+        github_status = "connected" if probe.result(timeout=HEALTH_CHECK_TIMEOUT) else "error"
+    except FuturesTimeoutError:
+        logger.error(f"GitHub connectivity test timed out after {HEALTH_CHECK_TIMEOUT}s")
+        github_status = f"error: timed out after {HEALTH_CHECK_TIMEOUT}s"
+    except Exception as e:
+        logger.error(f"GitHub connectivity test failed: {str(e)}")
+        github_status = f"error: {str(e)}"
+    
+    _health_cache['github'] = (github_status, time.monotonic() + HEALTH_CACHE_TTL)
+    return github_status
+
 @app.route(route="github/repos", auth_level=func.AuthLevel.ANONYMOUS)
 def get_github_repos(req: func.HttpRequest) -> func.HttpResponse:
     logger.info('Processing request for GitHub repos listing')
     
-    # Get token from environment
-    github_token = os.getenv('GITHUB_TOKEN')
-    username = 'yungryce'  # Your GitHub username
+    # Get the next token in rotation
+    github_token = _pick_token()
+    username = GITHUB_USERNAME
     
     if not github_token:
         logger.error('GitHub token not configured in environment variables')
         return func.HttpResponse(
-            json.dumps({"error": "GitHub token not configured"}),
+            orjson.dumps({"error": "GitHub token not configured"}),
             status_code=500,
             mimetype="application/json"
         )
     
-    # Create GitHub client
-    gh_client = GitHubClient(token=github_token, username=username)
+    # Get the shared GitHub client
+    gh_client = _get_client(github_token)
     
     try:
-        # Get the repositories
-        all_repos = gh_client.get_user_repos(username)
-        top_repos = all_repos[:10]  # Take only the first 10
+        # Get the repositories; only the first page is fetched when not cached
+        top_repos = gh_client.get_user_repos(username, limit=10)  # Take only the first 10
         
-        return func.HttpResponse(
-            json.dumps(top_repos),
-            status_code=200,
-            mimetype="application/json"
-        )
+        return _cacheable_response(req, orjson.dumps(top_repos), "application/json")
     except Exception as e:
         logger.error(f"Error fetching GitHub repositories: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({"error": f"Failed to fetch GitHub repositories: {str(e)}"}),
+            orjson.dumps({"error": f"Failed to fetch GitHub repositories: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
@@ -61,19 +185,19 @@ def get_github_repo(req: func.HttpRequest) -> func.HttpResponse:
     
     logger.info(f"Processing request for specific GitHub repo: {username}/{repo}")
     
-    # Get token from environment
-    github_token = os.getenv('GITHUB_TOKEN')
+    # Get the next token in rotation
+    github_token = _pick_token()
     
     if not github_token:
         logger.error('GitHub token not configured in environment variables')
         return func.HttpResponse(
-            json.dumps({"error": "GitHub token not configured"}),
+            orjson.dumps({"error": "GitHub token not configured"}),
             status_code=500,
             mimetype="application/json"
         )
     
-    # Create GitHub client
-    gh_client = GitHubClient(token=github_token, username=username)
+    # Get the shared GitHub client
+    gh_client = _get_client(github_token)
     
     try:
         # Get repository details
@@ -82,20 +206,16 @@ def get_github_repo(req: func.HttpRequest) -> func.HttpResponse:
         if not repo_details:
             logger.warning(f"Repository not found: {username}/{repo}")
             return func.HttpResponse(
-                json.dumps({"error": "Repository not found"}),
+                orjson.dumps({"error": "Repository not found"}),
                 status_code=404,
                 mimetype="application/json"
             )
         
-        return func.HttpResponse(
-            json.dumps(repo_details),
-            status_code=200,
-            mimetype="application/json"
-        )
+        return _cacheable_response(req, orjson.dumps(repo_details), "application/json")
     except Exception as e:
         logger.error(f"Error fetching repository details: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({"error": f"Failed to fetch repository details: {str(e)}"}),
+            orjson.dumps({"error": f"Failed to fetch repository details: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
@@ -108,19 +228,19 @@ def get_github_readme(req: func.HttpRequest) -> func.HttpResponse:
     
     logger.info(f"Processing request for GitHub repo README: {username}/{repo}")
     
-    # Get token from environment
-    github_token = os.getenv('GITHUB_TOKEN')
+    # Get the next token in rotation
+    github_token = _pick_token()
     
     if not github_token:
         logger.error('GitHub token not configured in environment variables')
         return func.HttpResponse(
-            json.dumps({"error": "GitHub token not configured"}),
+            orjson.dumps({"error": "GitHub token not configured"}),
             status_code=500,
             mimetype="application/json"
         )
     
-    # Create GitHub client
-    gh_client = GitHubClient(token=github_token, username=username)
+    # Get the shared GitHub client
+    gh_client = _get_client(github_token)
     
     try:
         # Get README content
@@ -129,20 +249,16 @@ def get_github_readme(req: func.HttpRequest) -> func.HttpResponse:
         if not readme_content:
             logger.warning(f"README not found for repository: {username}/{repo}")
             return func.HttpResponse(
-                json.dumps({"error": "README not found for this repository"}),
+                orjson.dumps({"error": "README not found for this repository"}),
                 status_code=404,
                 mimetype="application/json"
             )
         
-        return func.HttpResponse(
-            readme_content,
-            status_code=200,
-            mimetype="text/markdown"
-        )
+        return _cacheable_response(req, readme_content.encode('utf-8'), "text/markdown")
     except Exception as e:
         logger.error(f"Error fetching README: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({"error": f"Failed to fetch README: {str(e)}"}),
+            orjson.dumps({"error": f"Failed to fetch README: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
@@ -153,44 +269,55 @@ def portfolio_query(req: func.HttpRequest) -> func.HttpResponse:
     
     # Handle CORS preflight requests
     if req.method == "OPTIONS":
-        return func.HttpResponse(
-            status_code=200,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization"
-            }
-        )
+        return func.HttpResponse(status_code=204, headers=_PREFLIGHT_HEADERS)
     
     try:
+        # Reject oversized bodies before spending time and memory parsing them
+        body = req.get_body()
+        if len(body) > MAX_QUERY_BODY_BYTES:
+            logger.warning(f"Portfolio query body too large: {len(body)} bytes")
+            return func.HttpResponse(
+                orjson.dumps({"error": "Request body too large"}),
+                status_code=413,
+                mimetype="application/json"
+            )
+        
         # Parse request body
-        req_body = req.get_json()
-        query = req_body.get('query')
+        try:
+            req_body = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            logger.warning('Portfolio query request body is not valid JSON')
+            return func.HttpResponse(
+                orjson.dumps({"error": "Invalid JSON body"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        query = req_body.get('query') if isinstance(req_body, dict) else None
         
-        if not query:
+        if not query or not isinstance(query, str):
             logger.warning('Portfolio query request missing query parameter')
             return func.HttpResponse(
-                json.dumps({"error": "Missing query parameter"}),
+                orjson.dumps({"error": "Missing query parameter"}),
                 status_code=400,
                 mimetype="application/json"
             )
         
         logger.info(f"Portfolio query received: {query[:100]}...")
         
-        # Get GitHub token from environment
-        github_token = os.getenv('GITHUB_TOKEN')
-        username = 'yungryce'  # Your GitHub username
+        # Get the next GitHub token in rotation; repositories are fetched via GraphQL
+        github_token = _pick_token('graphql')
+        username = GITHUB_USERNAME
         
         if not github_token:
             logger.error('GitHub token not configured in environment variables')
             return func.HttpResponse(
-                json.dumps({"error": "GitHub token not configured"}),
+                orjson.dumps({"error": "GitHub token not configured"}),
                 status_code=500,
                 mimetype="application/json"
             )
         
-        # Create GitHub client
-        gh_client = GitHubClient(token=github_token, username=username)
+        # Get the shared GitHub client
+        gh_client = _get_client(github_token)
         
         # Try to get processed repos with graceful fallback
         try:
@@ -209,7 +336,7 @@ def portfolio_query(req: func.HttpRequest) -> func.HttpResponse:
                     filtered_repos = cached_repos
                 else:
                     return func.HttpResponse(
-                        json.dumps({
+                        orjson.dumps({
                             "error": "Network connectivity issue accessing GitHub API",
                             "message": "The server is having trouble connecting to GitHub. Please try again later."
                         }),
@@ -219,7 +346,7 @@ def portfolio_query(req: func.HttpRequest) -> func.HttpResponse:
             else:
                 # Other error
                 return func.HttpResponse(
-                    json.dumps({"error": f"Failed to retrieve repository data: {str(e)}"}),
+                    orjson.dumps({"error": f"Failed to retrieve repository data: {str(e)}"}),
                     status_code=500,
                     mimetype="application/json"
                 )
@@ -227,12 +354,12 @@ def portfolio_query(req: func.HttpRequest) -> func.HttpResponse:
         # Get AI response using the blueprint function
         try:
             logger.info("Querying AI assistant with repository data")
-            ai_response = query_ai_assistant(query, filtered_repos)
+            ai_response = _ai()(query, filtered_repos)
             logger.info(f"AI assistant generated a response of {len(ai_response)} chars")
         except Exception as e:
             logger.error(f"AI query failed: {str(e)}", exc_info=True)
             return func.HttpResponse(
-                json.dumps({"error": f"AI processing error: {str(e)}"}),
+                orjson.dumps({"error": f"AI processing error: {str(e)}"}),
                 status_code=500,
                 mimetype="application/json"
             )
@@ -243,16 +370,18 @@ def portfolio_query(req: func.HttpRequest) -> func.HttpResponse:
         }
         
         logger.info("Portfolio query processed successfully")
+        body, headers = _compressed(req, orjson.dumps(result))
         return func.HttpResponse(
-            json.dumps(result),
+            body,
             status_code=200,
+            headers=headers,
             mimetype="application/json"
         )
             
     except Exception as e:
         logger.error(f"Error processing portfolio query: {str(e)}", exc_info=True)
         return func.HttpResponse(
-            json.dumps({"error": f"Internal server error: {str(e)}"}),
+            orjson.dumps({"error": f"Internal server error: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
@@ -264,32 +393,20 @@ def health_check(req: func.HttpRequest) -> func.HttpResponse:
     logger.info('Processing API health check')
     
     # Perform basic GitHub connectivity test
-    github_token = os.getenv('GITHUB_TOKEN')
+    github_token = _pick_token()
     if github_token:
-        try:
-            # Create GitHub client with short cache TTL
-            gh_client = GitHubClient(token=github_token, username='yungryce')
-            gh_client.cache_ttl = 60  # 1 minute cache
-            
-            # Test GitHub API connectivity
-            rate_limit = gh_client.make_request('GET', 'rate_limit')
-            github_status = "connected" if rate_limit else "error"
-        except Exception as e:
-            logger.error(f"GitHub connectivity test failed: {str(e)}")
-            github_status = f"error: {str(e)}"
+        github_status = _github_health_status(github_token)
     else:
         github_status = "unconfigured"
     
     # Check GROQ API key
-    groq_api_key = os.getenv('GROQ_API_KEY')
-    groq_status = "configured" if groq_api_key else "unconfigured"
+    groq_status = "configured" if GROQ_API_KEY else "unconfigured"
     
     # Check Azure Storage
-    azure_storage = os.getenv('AzureWebJobsStorage')
-    storage_status = "configured" if azure_storage else "unconfigured"
+    storage_status = "configured" if AZURE_STORAGE else "unconfigured"
     
     return func.HttpResponse(
-        json.dumps({
+        orjson.dumps({
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "environment": {
@@ -1,21 +1,377 @@
-import json
+import gzip
+import hashlib
 import logging
+import orjson
 import os
+import random
 import re
 import requests
+import threading
 import time
-from datetime import datetime, timedelta
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient, ContentSettings
 from base64 import b64decode
+from urllib.parse import parse_qs, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logger = logging.getLogger('portfolio.github_client')
 logger.setLevel(logging.INFO)
 
+# Maximum number of repositories processed concurrently
+MAX_REPO_WORKERS = 10
+
+# Special files probed for structured metadata, in parse_repo_metadata order
+SPECIAL_FILES = ('.repo-context.json', 'PROJECT-MANIFEST.md', 'SKILLS-INDEX.md')
+
+# Bytes of README downloaded when processing repositories
+README_MAX_BYTES = 16384
+
+# Number of repositories fetched per GraphQL page
+GRAPHQL_PAGE_SIZE = 50
+
+# Special metadata files, in SPECIAL_FILES order
+METADATA_FILE_FIELDS = """
+    context: object(expression: "HEAD:.repo-context.json") { ... on Blob { text } }
+    manifest: object(expression: "HEAD:PROJECT-MANIFEST.md") { ... on Blob { text } }
+    skills: object(expression: "HEAD:SKILLS-INDEX.md") { ... on Blob { text } }
+"""
+
+# Per-repository details selected alongside the repository listing
+REPO_BUNDLE_FIELDS = """
+    languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { nodes { name } }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+    readme_lower: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+""" + METADATA_FILE_FIELDS
+
+# Metadata files for a single repository
+METADATA_FILES_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    %s
+  }
+}
+""" % METADATA_FILE_FIELDS
+
+# Repository listing plus per-repository details in one paginated query;
+# public, owned repositories match the REST /users/{username}/repos listing
+PORTFOLIO_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: [OWNER], privacy: PUBLIC,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        description
+        url
+        isFork
+        diskUsage
+        stargazerCount
+        updatedAt
+        primaryLanguage { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        %s
+      }
+    }
+  }
+}
+""" % REPO_BUNDLE_FIELDS
+
+# Cap on in-flight GitHub requests across all threads, to stay clear of
+# GitHub's secondary (concurrency) rate limits
+MAX_CONCURRENT_REQUESTS = 10
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Token bucket keeping outbound requests under GitHub's secondary limit of
+# 900 REST requests per minute; bursts up to the full minute's budget
+MAX_REQUESTS_PER_MINUTE = 900
+_bucket = {'tokens': float(MAX_REQUESTS_PER_MINUTE), 'updated': time.monotonic()}
+_bucket_lock = threading.Lock()
+
+def _throttle():
+    """Block until the request rate budget allows another GitHub request."""
+    rate = MAX_REQUESTS_PER_MINUTE / 60.0
+    while True:
+        with _bucket_lock:
+            now = time.monotonic()
+            _bucket['tokens'] = min(MAX_REQUESTS_PER_MINUTE, _bucket['tokens'] + (now - _bucket['updated']) * rate)
+            _bucket['updated'] = now
+            if _bucket['tokens'] >= 1:
+                _bucket['tokens'] -= 1
+                return
+            wait_time = (1 - _bucket['tokens']) / rate
+        time.sleep(wait_time)
+
+# (connect, read) timeouts in seconds: fail fast on an unreachable host,
+# but give slow API responses time to complete
+REQUEST_TIMEOUT = (3.05, 15)
+
+# Longest rate-limit wait (seconds) worth blocking a request for
+MAX_RATE_LIMIT_WAIT = 60
+
+# Bounds in seconds for the delay between attempts that failed to get a response
+RETRY_BASE_DELAY = 1
+MAX_RETRY_DELAY = 30
+
+def _retry_delay(previous_delay):
+    """Next delay between failed attempts, using decorrelated jitter to avoid synchronized retries."""
+    return min(MAX_RETRY_DELAY, random.uniform(RETRY_BASE_DELAY, previous_delay * 3))
+
+# Shared HTTP session so GitHub connections are kept alive and pooled
+# across requests, threads and client instances. Transient server errors
+# are retried at the transport level; connection failures and timeouts are
+# retried only by _send, and rate limits are handled there too. Retry-After
+# is left to _send, which caps the wait and sleeps outside the request slots.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        connect=0,
+        read=0,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+))
+_session.headers.update({'Accept': 'application/vnd.github+json'})
+
+# Session for health probes: no transport retries, and used outside the
+# request slots and rate limiter so a probe never queues behind other work
+_probe_session = requests.Session()
+_probe_session.mount('https://', HTTPAdapter(max_retries=0))
+_probe_session.headers.update({'Accept': 'application/vnd.github+json'})
+
+def ping_github(token, timeout):
+    """Check that the GitHub API answers, with a single attempt and no caching."""
+    headers = {'Authorization': f'token {token}'} if token else {}
+    response = _probe_session.get('https://api.github.com/rate_limit', headers=headers, timeout=timeout)
+    _record_rate_limit(token, response)
+    return response.status_code == 200
+
+def _response_text(response):
+    """Decode a response body, assuming UTF-8 when no charset is declared.
+    
+    GitHub's raw media types carry no charset, and requests would otherwise
+    run charset detection over the whole body (slow for large READMEs).
+    """
+    return response.content.decode(response.encoding or 'utf-8', errors='replace')
+
+def _rate_limit_wait(response, attempt):
+    """Return seconds to wait before retrying a rate-limited response, or None."""
+    if response.status_code not in (403, 429):
+        return None
+    
+    # Secondary rate limits tell us exactly how long to back off
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    
+    # Primary rate limit: wait until the quota window resets
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+        return max(0, reset_time - time.time()) + 1
+    
+    # Rate limited without a hint: exponential backoff with jitter
+    if response.status_code == 429 or 'rate limit' in _response_text(response).lower():
+        return 2 ** attempt + random.uniform(0, 1)
+    
+    # Any other 403 is a permission problem, not worth retrying
+    return None
+
+# Last seen primary rate-limit state per (token, resource): (remaining, reset epoch).
+# GitHub budgets REST ('core') and GraphQL ('graphql') quotas separately.
+_token_limits = {}
+
+def _record_rate_limit(token, response):
+    """Remember a token's remaining quota from GitHub's rate-limit headers."""
+    remaining = response.headers.get('X-RateLimit-Remaining')
+    if token and remaining is not None:
+        resource = response.headers.get('X-RateLimit-Resource', 'core')
+        try:
+            _token_limits[(token, resource)] = (int(remaining), int(response.headers.get('X-RateLimit-Reset', 0)))
+        except ValueError:
+            pass
+
+def is_token_exhausted(token, resource='core'):
+    """Whether a token's last seen quota for a rate-limit resource is used up and not yet reset."""
+    remaining, reset_time = _token_limits.get((token, resource), (None, 0))
+    return remaining == 0 and reset_time > time.time()
+
+# Second-level markdown headers, which start and end sections, and code fence
+# lines, so that lines inside fenced blocks are never taken for headers. Both
+# may be indented by up to three spaces, as in CommonMark.
+SECTION_LINE_RE = re.compile(r"^[ ]{0,3}(?:(?P<fence>```|~~~)|##[ \t]+(?P<title>.+?)[ \t\r]*$)", re.MULTILINE)
+
+# Recognised second-level README headers and the keys they are stored under;
+# titles may carry trailing text such as an emoji
+SECTION_KEYS = {
+    'technology signature': 'tech_stack',
+    'demonstrated competencies': 'skills',
+    'system architecture': 'architecture',
+    'project structure': 'structure',
+    'deployment workflow': 'workflow'
+}
+
+def _split_readme_sections(readme_content):
+    """Split a README on its second-level headers in a single pass."""
+    headers = []
+    in_fence = False
+    for match in SECTION_LINE_RE.finditer(readme_content):
+        if match.group('fence'):
+            in_fence = not in_fence
+        elif not in_fence:
+            headers.append(match)
+    
+    sections = {}
+    for i, header in enumerate(headers):
+        title = header.group('title').lower()
+        key = next((key for name, key in SECTION_KEYS.items() if title.startswith(name)), None)
+        if key and key not in sections:
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(readme_content)
+            sections[key] = readme_content[header.end():end].strip()
+    return sections
+
+# Extracted sections memoized by a digest of the README, so the cache holds
+# 16-byte keys rather than keeping whole READMEs alive
+README_SECTIONS_CACHE_SIZE = 512
+_readme_sections_cache = OrderedDict()
+_readme_sections_lock = threading.Lock()
+
+def _extract_readme_sections(readme_content):
+    """Return README sections, memoized on a blake2b digest of the text."""
+    digest = hashlib.blake2b(readme_content.encode('utf-8'), digest_size=16).digest()
+    with _readme_sections_lock:
+        sections = _readme_sections_cache.get(digest)
+        if sections is not None:
+            _readme_sections_cache.move_to_end(digest)
+            return sections
+    
+    sections = _split_readme_sections(readme_content)
+    with _readme_sections_lock:
+        _readme_sections_cache[digest] = sections
+        if len(_readme_sections_cache) > README_SECTIONS_CACHE_SIZE:
+            _readme_sections_cache.popitem(last=False)
+    return sections
+
+# Cache TTLs (seconds) by endpoint class: file contents rarely change, while
+# the repository list changes on every push. Other endpoints use cache_ttl.
+ENDPOINT_TTLS = [
+    (re.compile(r'^repos/[^/]+/[^/]+/readme'), 86400),
+    (re.compile(r'^repos/[^/]+/[^/]+/contents/'), 86400),
+    (re.compile(r'^repos/[^/]+/[^/]+/languages$'), 21600),
+    (re.compile(r'^users/[^/]+/repos'), 900)
+]
+
+def _endpoint_ttl(endpoint):
+    """Return the cache TTL for an endpoint, or None to use the client default."""
+    endpoint = endpoint.lstrip('/')
+    return next((ttl for pattern, ttl in ENDPOINT_TTLS if pattern.match(endpoint)), None)
+
+# Prefix on cache blob names; bump it when the stored format changes so old
+# blobs are ignored rather than misparsed
+CACHE_FORMAT_VERSION = 'v3'
+
+# Cached JSON is highly repetitive (field names, URL prefixes), so blobs are
+# gzipped; a fast level keeps compression well under a millisecond
+CACHE_COMPRESS_LEVEL = 3
+GZIP_MAGIC = b'\x1f\x8b'
+
+def _read_blob(blob_client):
+    """Download a cache blob chunk by chunk, inflating gzipped content as it arrives."""
+    buffer = bytearray()
+    inflater = None
+    for i, chunk in enumerate(blob_client.download_blob().chunks()):
+        # Blobs written before compression was added are plain JSON
+        if i == 0 and chunk[:2] == GZIP_MAGIC:
+            inflater = zlib.decompressobj(wbits=31)
+        buffer += inflater.decompress(chunk) if inflater else chunk
+    if inflater:
+        buffer += inflater.flush()
+    return buffer
+
+# Blob containers known to exist, so later clients skip the storage round-trip
+_containers_ready = set()
+
+# Cache keys currently being fetched, each with an Event set once it is done
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# Longest time (seconds) a request waits on another thread's identical fetch
+INFLIGHT_WAIT = 30
+
+def _single_flight(key, fetch, recheck):
+    """Run fetch for key, or wait for a concurrent fetch of the same key and return recheck() instead.
+    
+    Falls back to fetching when the other fetch times out or leaves nothing to recheck.
+    """
+    with _inflight_lock:
+        event = _inflight.get(key)
+        leader = event is None
+        if leader:
+            event = _inflight[key] = threading.Event()
+    
+    if not leader:
+        event.wait(INFLIGHT_WAIT)
+        result = recheck()
+        return result if result is not None else fetch()
+    
+    try:
+        return fetch()
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        event.set()
+
+# Process-local copy of cache entries, consulted before Blob Storage.
+# Azure Functions keeps workers warm between invocations, so this survives
+# across requests handled by the same process. Entries are kept serialized
+# so every read gets fresh objects that callers are free to mutate.
+MEMORY_CACHE_SIZE = 512
+_memory_cache = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+def _remember(cache_key, serialized):
+    """Store a serialized cache entry in process memory, evicting the least recently used when full."""
+    with _memory_cache_lock:
+        _memory_cache[cache_key] = serialized
+        _memory_cache.move_to_end(cache_key)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+def _recall(cache_key):
+    """Look up a cache entry in process memory, marking it recently used."""
+    with _memory_cache_lock:
+        serialized = _memory_cache.get(cache_key)
+        if serialized is None:
+            return None
+        _memory_cache.move_to_end(cache_key)
+    return orjson.loads(serialized)
+
+def _needs_details(repo):
+    """Check whether a listed repository is worth fetching languages, README and metadata for."""
+    # Forks mostly carry upstream content rather than the owner's own work,
+    # and empty repositories (size 0 KB) have no files to fetch
+    return not repo.get('fork', False) and repo.get('size') != 0
+
+def _blob_text(blob):
+    """Return the text of a GraphQL Blob object, or None if missing."""
+    return blob.get('text') if blob else None
+
 class GitHubClient:
     """Centralized client for GitHub API with caching and error handling."""
     
-    def __init__(self, token=None, username=None, use_cache=True):
+    def __init__(self, token=None, username=None, use_cache=True, session=None):
         """Initialize the GitHub client with authentication."""
         self.token = token or os.getenv('GITHUB_TOKEN')
         self.username = username or 'yungryce'  # Default to your username
@@ -23,6 +379,10 @@ class GitHubClient:
         self.use_cache = use_cache
         self.cache_ttl = 3600  # Default cache TTL: 1 hour
         
+        # Pooled connections are shared by default; a caller-supplied session
+        # (e.g. with different adapters) is closed along with the client
+        self.session = session or _session
+        
         # Connect to Azure Blob Storage for caching
         connection_string = os.getenv('AzureWebJobsStorage')
         if connection_string and self.use_cache:
@@ -30,89 +390,148 @@ class GitHubClient:
                 self.blob_service_client = BlobServiceClient.from_connection_string(connection_string)
                 self.container_name = 'github-cache'
                 
-                # Create container if it doesn't exist
-                try:
-                    self.blob_service_client.create_container(self.container_name)
-                    logger.info(f"Created cache container: {self.container_name}")
-                except Exception:
-                    # Container likely already exists
-                    logger.debug(f"Container {self.container_name} already exists")
+                # Reuse container and blob clients instead of rebuilding them per cache access
+                self.container_client = self.blob_service_client.get_container_client(self.container_name)
+                self._blob_clients = {}
+                
+                # Create container if it doesn't exist, checking once per process
+                if self.container_name not in _containers_ready:
+                    try:
+                        if not self.container_client.exists():
+                            self.container_client.create_container()
+                            logger.info(f"Created cache container: {self.container_name}")
+                        _containers_ready.add(self.container_name)
+                    except ResourceExistsError:
+                        # Created concurrently by another worker
+                        _containers_ready.add(self.container_name)
+                    except Exception as e:
+                        logger.warning(f"Could not verify cache container {self.container_name}: {str(e)}")
                     
                 logger.info("Azure Storage cache initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize Azure Storage cache: {str(e)}")
                 self.blob_service_client = None
         else:
-            logger.warning("Azure Storage connection string not found, caching disabled")
+            if self.use_cache:
+                logger.warning("Azure Storage connection string not found, using in-memory cache only")
             self.blob_service_client = None
     
+    def close(self):
+        """Release the client's session unless it is the shared module session."""
+        if self.session is not _session:
+            self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _blob_client(self, cache_key):
+        """Return the BlobClient for a cache key, creating it on first use."""
+        blob_client = self._blob_clients.get(cache_key)
+        if blob_client is None:
+            if len(self._blob_clients) >= MEMORY_CACHE_SIZE:
+                self._blob_clients.clear()
+            blob_client = self._blob_clients[cache_key] = self.container_client.get_blob_client(cache_key)
+        return blob_client
+    
     def _cache_key(self, endpoint):
-        """Generate a cache key for a given endpoint."""
-        return f"{endpoint.replace('/', '_')}"
+        """Generate a cache key for a given endpoint.
+        
+        Hashing keeps blob names short and valid for any file path, and avoids
+        collisions such as repos/x/y versus repos_x_y.
+        """
+        return f"{CACHE_FORMAT_VERSION}_{hashlib.blake2b(endpoint.encode('utf-8'), digest_size=16).hexdigest()}"
     
-    def _get_from_cache(self, endpoint):
-        """Retrieve data from cache if available and not expired."""
-        if not self.blob_service_client or not self.use_cache:
+    def _read_cache_entry(self, endpoint):
+        """Read the raw cache entry for an endpoint, whether expired or not."""
+        if not self.use_cache:
             return None
             
         cache_key = self._cache_key(endpoint)
+        
+        # Fresh entries in process memory skip the Blob Storage round-trip
+        memory_entry = _recall(cache_key)
+        if memory_entry is not None and (self._is_fresh(memory_entry) or not self.blob_service_client):
+            return memory_entry
+        
+        if not self.blob_service_client:
+            return None
+            
         try:
             # Get the blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, 
-                blob=cache_key
-            )
+            blob_client = self._blob_client(cache_key)
             
-            # Check if blob exists
-            if blob_client.exists():
-                # Download the blob
-                data = blob_client.download_blob().readall()
-                cache_data = json.loads(data)
-                
-                # Check expiration
-                if 'expires_at' in cache_data:
-                    expires_at = datetime.fromisoformat(cache_data['expires_at'])
-                    if expires_at > datetime.now():
-                        logger.info(f"Cache hit for {endpoint}")
-                        return cache_data['data']
-                    else:
-                        logger.debug(f"Cache expired for {endpoint}")
-                
-                # Delete expired blob
-                blob_client.delete_blob()
-                
-            return None
+            # Download directly; a missing blob costs the same single round-trip
+            # as an exists() check would
+            serialized = bytes(_read_blob(blob_client))
+            _remember(cache_key, serialized)
+            return orjson.loads(serialized)
+        except ResourceNotFoundError:
+            return memory_entry
         except Exception as e:
             logger.warning(f"Error reading from cache: {str(e)}")
+            return memory_entry
+    
+    def _is_fresh(self, cache_data):
+        """Check whether a cache entry has not yet expired."""
+        return cache_data.get('expires_at', 0) > time.time()
+    
+    def _get_from_cache(self, endpoint):
+        """Retrieve data from cache if available and not expired."""
+        cache_data = self._read_cache_entry(endpoint)
+        if cache_data is None:
             return None
+        
+        # Expired entries are kept so their ETag can be used for revalidation
+        if self._is_fresh(cache_data):
+            logger.info(f"Cache hit for {endpoint}")
+            return cache_data['data']
+        
+        logger.debug(f"Cache expired for {endpoint}")
+        return None
     
-    def _save_to_cache(self, endpoint, data, ttl=None):
-        """Save data to cache with expiration time."""
-        if not self.blob_service_client or not self.use_cache:
+    def _save_to_cache(self, endpoint, data, ttl=None, etag=None, last_modified=None):
+        """Save data to cache with expiration time and optional validators."""
+        if not self.use_cache:
             return False
             
         ttl = ttl or self.cache_ttl
         cache_key = self._cache_key(endpoint)
         
+        # Prepare data with expiration, as Unix timestamps
+        now = int(time.time())
+        cache_data = {
+            'data': data,
+            'expires_at': now + ttl,
+            'cached_at': now,
+            # Keys are opaque digests; keep the endpoint for debugging
+            'endpoint': endpoint
+        }
+        if etag:
+            cache_data['etag'] = etag
+        if last_modified:
+            cache_data['last_modified'] = last_modified
+        
+        # Keep a process-local copy; this works even without Blob Storage
+        serialized = orjson.dumps(cache_data)
+        _remember(cache_key, serialized)
+        
+        if not self.blob_service_client:
+            return True
+        
         try:
-            # Prepare data with expiration
-            cache_data = {
-                'data': data,
-                'expires_at': (datetime.now() + timedelta(seconds=ttl)).isoformat(),
-                'cached_at': datetime.now().isoformat()
-            }
-            
             # Get the blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, 
-                blob=cache_key
-            )
+            blob_client = self._blob_client(cache_key)
             
-            # Upload the data
+            # Upload the data; a known length lets small blobs go up in a single PUT
+            payload = gzip.compress(serialized, compresslevel=CACHE_COMPRESS_LEVEL)
             blob_client.upload_blob(
-                json.dumps(cache_data),
+                payload,
+                length=len(payload),
                 overwrite=True,
-                content_settings=ContentSettings(content_type='application/json')
+                content_settings=ContentSettings(content_type='application/gzip')
             )
             
             logger.info(f"Saved to cache: {endpoint}")
@@ -121,11 +540,27 @@ class GitHubClient:
             logger.warning(f"Error saving to cache: {str(e)}")
             return False
     
-    def make_request(self, method, endpoint, headers=None, params=None, data=None, accept_raw=False, use_cache=None):
+    def make_request(self, method, endpoint, headers=None, params=None, data=None, accept_raw=False, use_cache=None, cache_key=None):
         """Make a request to GitHub API with caching and error handling."""
         use_cache = self.use_cache if use_cache is None else use_cache
+        
+        def fetch():
+            return self._make_request(method, endpoint, headers, params, data, accept_raw, use_cache, cache_key)
+        
+        if method.upper() != 'GET' or not use_cache:
+            return fetch()
+        
+        # Concurrent misses for the same cache entry share a single upstream request
+        key = cache_key or endpoint
+        return _single_flight(key, fetch, lambda: self._get_from_cache(key))
+    
+    def _make_request(self, method, endpoint, headers, params, data, accept_raw, use_cache, cache_key):
+        """Perform a GitHub API request, serving and refreshing the cache for GETs."""
         full_url = f"https://api.github.com/{endpoint.lstrip('/')}"
         
+        # Requests for partial content must not share a cache entry with the full response
+        cache_key = cache_key or endpoint
+        
         # Merge default headers with custom headers
         request_headers = self.headers.copy()
         if headers:
@@ -139,135 +574,237 @@ class GitHubClient:
         cache_eligible = method.upper() == 'GET' and use_cache
         
         # Check cache first for GET requests
+        cached_entry = None
         if cache_eligible:
-            cache_data = self._get_from_cache(endpoint)
-            if cache_data is not None:
-                return cache_data
+            cached_entry = self._read_cache_entry(cache_key)
+            if cached_entry is not None:
+                if self._is_fresh(cached_entry):
+                    logger.info(f"Cache hit for {cache_key}")
+                    return cached_entry['data']
+                
+                # Revalidate the stale entry; a 304 reply is free of rate-limit cost
+                if cached_entry.get('etag'):
+                    request_headers['If-None-Match'] = cached_entry['etag']
+                if cached_entry.get('last_modified'):
+                    request_headers['If-Modified-Since'] = cached_entry['last_modified']
+        
+        response = self._send(method, full_url, request_headers, params=params, data=data)
+        
+        # Unchanged upstream: extend the cached copy instead of re-downloading
+        if response.status_code == 304 and cached_entry is not None:
+            logger.info(f"Cache revalidated for {cache_key}")
+            self._save_to_cache(
+                cache_key,
+                cached_entry['data'],
+                ttl=_endpoint_ttl(endpoint),
+                etag=cached_entry.get('etag'),
+                last_modified=cached_entry.get('last_modified')
+            )
+            return cached_entry['data']
+        
+        # Ranged requests come back as 206 Partial Content
+        success = response.status_code in (200, 206)
         
-        # Make the request with retries
+        # If successful and it's a GET request, cache the result
+        if success and cache_eligible:
+            if accept_raw:
+                result = _response_text(response)
+            else:
+                try:
+                    result = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    result = _response_text(response)
+            
+            # Cache the result
+            self._save_to_cache(
+                cache_key,
+                result,
+                ttl=_endpoint_ttl(endpoint),
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+            return result
+        
+        # Return the response directly for success or failure
+        if accept_raw:
+            return _response_text(response) if success else None
+        else:
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                return _response_text(response)
+    
+    def _send(self, method, url, headers, params=None, data=None):
+        """Send a request with retries and rate-limit handling, returning the response."""
         retries = 3
-        backoff = 1
+        delay = RETRY_BASE_DELAY
         last_exception = None
         
         for attempt in range(retries):
             try:
-                logger.debug(f"Making {method} request to {full_url} (attempt {attempt+1}/{retries})")
-                response = requests.request(
-                    method=method,
-                    url=full_url,
-                    headers=request_headers,
-                    params=params,
-                    json=data,
-                    timeout=10  # Add a reasonable timeout
-                )
+                logger.debug(f"Making {method} request to {url} (attempt {attempt+1}/{retries})")
+                _throttle()
+                with _request_slots:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        json=data,
+                        timeout=REQUEST_TIMEOUT
+                    )
+                _record_rate_limit(self.token, response)
                 
                 # Handle rate limiting
-                if response.status_code == 403 and 'X-RateLimit-Remaining' in response.headers:
-                    remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-                    if remaining == 0:
-                        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                        wait_time = max(0, reset_time - time.time())
-                        logger.warning(f"Rate limit exceeded, waiting {wait_time:.2f}s")
-                        if wait_time > 0 and wait_time < 60:  # Only wait if reasonable
-                            time.sleep(wait_time + 1)
-                            continue
-                
-                # If successful and it's a GET request, cache the result
-                if response.status_code == 200 and cache_eligible:
-                    if accept_raw:
-                        result = response.text
-                    else:
-                        try:
-                            result = response.json()
-                        except:
-                            result = response.text
-                    
-                    # Cache the result
-                    self._save_to_cache(endpoint, result)
-                    return result
+                wait_time = _rate_limit_wait(response, attempt)
+                if wait_time is not None and attempt < retries - 1:
+                    logger.warning(f"Rate limit exceeded, waiting {wait_time:.2f}s")
+                    if wait_time < MAX_RATE_LIMIT_WAIT:  # Only wait if reasonable
+                        time.sleep(wait_time)
+                        continue
                 
-                # Return the response directly for success or failure
-                if accept_raw:
-                    return response.text if response.status_code == 200 else None
-                else:
-                    try:
-                        return response.json()
-                    except:
-                        return response.text
+                return response
                 
             except requests.exceptions.ConnectionError as e:
                 logger.warning(f"Connection error on attempt {attempt+1}: {str(e)}")
                 last_exception = e
                 if "Failed to resolve" in str(e) or "Name or service not known" in str(e):
                     logger.error(f"DNS resolution failure when connecting to GitHub API")
-                time.sleep(backoff)
-                backoff *= 2
-                continue
                 
             except Exception as e:
                 logger.warning(f"Request error on attempt {attempt+1}: {str(e)}")
                 last_exception = e
-                time.sleep(backoff)
-                backoff *= 2
-                continue
+            
+            # No point sleeping after the final attempt
+            if attempt < retries - 1:
+                delay = _retry_delay(delay)
+                time.sleep(delay)
         
         # If we get here, all retries failed
-        logger.error(f"All {retries} attempts failed for {full_url}: {str(last_exception)}")
+        logger.error(f"All {retries} attempts failed for {url}: {str(last_exception)}")
         raise Exception(f"GitHub API request failed after {retries} attempts: {str(last_exception)}")
     
-    def get_user_repos(self, username=None, per_page=100):
-        """Get repositories for a user with pagination handling."""
+    def get_user_repos(self, username=None, per_page=100, limit=None):
+        """Get repositories for a user, fetching pages after the first concurrently.
+        
+        With limit, stop after the first limit repositories instead of paging through all.
+        """
         username = username or self.username
-        endpoint = f"users/{username}/repos"
-        params = {'sort': 'updated', 'per_page': per_page}
         
         # Check if we have this cached
         cache_key = f"users_{username}_repos_full"
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
             logger.info(f"Using cached repository data for {username}")
-            return cached_data
+            return cached_data[:limit] if limit else cached_data
         
-        # If not cached, fetch all pages
-        all_repos = []
-        page = 1
+        # A limited listing is cached on its own, since it never holds the full list
+        limited_key = f"users_{username}_repos_first_{limit}" if limit else None
+        if limited_key:
+            cached_data = self._get_from_cache(limited_key)
+            if cached_data is not None:
+                logger.info(f"Using cached first {limit} repositories for {username}")
+                return cached_data
         
-        while True:
-            params['page'] = page
+        fetch_key = limited_key or cache_key
+        return _single_flight(
+            fetch_key,
+            lambda: self._fetch_user_repos(username, per_page, limit),
+            lambda: self._get_from_cache(fetch_key)
+        )
+    
+    def _fetch_user_repos(self, username, per_page, limit):
+        """Fetch a user's repository pages from GitHub and cache the result."""
+        url = f"https://api.github.com/users/{username}/repos"
+        params = {'sort': 'updated', 'per_page': min(per_page, limit) if limit else per_page}
+        cache_key = f"users_{username}_repos_full"
+        limited_key = f"users_{username}_repos_first_{limit}" if limit else None
+        ttl = _endpoint_ttl(f"users/{username}/repos")
+        
+        def fetch_page(page, headers=self.headers):
             logger.info(f"Fetching repositories page {page} for {username}")
-            
             try:
-                repos = self.make_request('GET', endpoint, params=params)
+                response = self._send('GET', url, headers, params={**params, 'page': page})
+                if response.status_code == 304:
+                    return response, None
+                if response.status_code != 200:
+                    logger.error(f"Unexpected status {response.status_code} fetching repos for {username}, page {page}")
+                    return None, None
                 
-                if not repos or not isinstance(repos, list):
-                    break
-                    
-                all_repos.extend(repos)
+                repos = orjson.loads(response.content)
                 logger.info(f"Fetched {len(repos)} repositories on page {page}")
-                
-                if len(repos) < per_page:
-                    break
-                    
-                page += 1
-                
+                return response, repos if isinstance(repos, list) else []
             except Exception as e:
                 logger.error(f"Error fetching repos for {username}, page {page}: {str(e)}")
-                break
+                return None, None
         
-        # Cache the complete repository list
-        if all_repos:
-            self._save_to_cache(cache_key, all_repos, ttl=7200)  # Cache for 2 hours
-            
-        return all_repos
+        # Revalidate an expired listing against its first page's ETag. Sorted by
+        # update time, any pushed repository moves to page 1, so a 304 there
+        # means the list is unchanged.
+        stale_entry = self._read_cache_entry(limited_key or cache_key)
+        first_page_headers = self.headers
+        if stale_entry is not None and stale_entry.get('etag'):
+            first_page_headers = {**self.headers, 'If-None-Match': stale_entry['etag']}
+        
+        # Otherwise the first page's rel="last" link gives the page count
+        response, all_repos = fetch_page(1, first_page_headers)
+        if response is not None and response.status_code == 304:
+            logger.info(f"Repository list for {username} unchanged")
+            self._save_to_cache(limited_key or cache_key, stale_entry['data'], ttl=ttl, etag=stale_entry['etag'])
+            return stale_entry['data']
+        if all_repos is None:
+            return []
+        etag = response.headers.get('ETag')
+        
+        last_url = response.links.get('last', {}).get('url')
+        last_page = int(parse_qs(urlparse(last_url).query).get('page', ['1'])[0]) if last_url else 1
+        complete = True
+        
+        # Fetch only the pages the limit needs
+        if limit:
+            needed_pages = -(-limit // params['per_page'])
+            complete = last_page <= needed_pages
+            last_page = min(last_page, needed_pages)
+        
+        # Fetch the remaining pages concurrently, keeping page order
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_REPO_WORKERS, last_page - 1)) as executor:
+                for _, repos in executor.map(fetch_page, range(2, last_page + 1)):
+                    if repos is None:
+                        complete = False
+                        break
+                    all_repos.extend(repos)
+        
+        # Cache the repository list only when it is complete
+        if all_repos and complete:
+            self._save_to_cache(cache_key, all_repos, ttl=ttl, etag=None if limit else etag)
+        
+        if not limit:
+            return all_repos
+        
+        # The limited slice is cached whenever the pages it needs all arrived
+        top_repos = all_repos[:limit]
+        if top_repos and (complete or len(top_repos) == limit):
+            self._save_to_cache(limited_key, top_repos, ttl=ttl, etag=etag)
+        return top_repos
     
-    def get_readme(self, username=None, repo=None):
-        """Get README content for a repository."""
+    def get_readme(self, username=None, repo=None, max_bytes=None):
+        """Get README content for a repository, optionally only its first max_bytes."""
         username = username or self.username
         if not repo:
             raise ValueError("Repository name is required")
             
         endpoint = f"repos/{username}/{repo}/readme"
-        return self.make_request('GET', endpoint, accept_raw=True)
+        if not max_bytes:
+            return self.make_request('GET', endpoint, accept_raw=True)
+        
+        return self.make_request(
+            'GET',
+            endpoint,
+            headers={'Range': f"bytes=0-{max_bytes - 1}"},
+            accept_raw=True,
+            cache_key=f"{endpoint}_first_{max_bytes}"
+        )
     
     def extract_readme_sections(self, readme_content):
         """Extract meaningful sections from README content."""
@@ -275,21 +812,8 @@ class GitHubClient:
             return {}
             
         logger.debug("Extracting sections from README content")
-        sections = {}
-        
-        # Common pattern headers
-        section_patterns = [
-            (r"## Technology Signature\s+(.*?)(?=##|\Z)", "tech_stack"),
-            (r"## Demonstrated Competencies\s+(.*?)(?=##|\Z)", "skills"),
-            (r"## System Architecture\s+(.*?)(?=##|\Z)", "architecture"),
-            (r"## Project Structure\s+(.*?)(?=##|\Z)", "structure"),
-            (r"## Deployment Workflow\s+(.*?)(?=##|\Z)", "workflow")
-        ]
-        
-        for pattern, key in section_patterns:
-            matches = re.search(pattern, readme_content, re.DOTALL)
-            if matches:
-                sections[key] = matches.group(1).strip()
+        # Copy so callers can't mutate the memoized result
+        sections = dict(_extract_readme_sections(readme_content))
         
         logger.debug(f"Found {len(sections)} README sections")
         return sections
@@ -326,44 +850,197 @@ class GitHubClient:
     def extract_repo_metadata(self, repo_name, username=None):
         """Extract structured metadata from special files in the repository."""
         username = username or self.username
-        metadata = {}
         
-        # Check for repo-context.json at root
-        try:
-            logger.debug(f"Checking for .repo-context.json in {username}/{repo_name}")
-            context_data = self.get_file_content(username, repo_name, '.repo-context.json')
-            if context_data:
-                try:
-                    context_json = json.loads(context_data)
-                    metadata['context'] = context_json
-                    logger.debug(f"Extracted .repo-context.json from {repo_name}")
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON in .repo-context.json for {repo_name}")
-        except Exception as e:
-            logger.debug(f"No .repo-context.json found for {repo_name}: {str(e)}")
+        # One GraphQL query returns all special files; REST needs one call per file
+        if self.token:
+            try:
+                files = self.graphql(METADATA_FILES_QUERY, {'owner': username, 'name': repo_name}).get('repository')
+                if files is not None:
+                    return self.parse_repo_metadata(
+                        repo_name,
+                        _blob_text(files.get('context')),
+                        _blob_text(files.get('manifest')),
+                        _blob_text(files.get('skills'))
+                    )
+            except Exception as e:
+                logger.warning(f"GraphQL metadata fetch failed for {repo_name}, falling back to REST: {str(e)}")
         
-        # Check for PROJECT-MANIFEST.md files in subdirectories
-        try:
-            manifest_content = self.get_file_content(username, repo_name, 'PROJECT-MANIFEST.md')
-            if manifest_content:
-                metadata['manifest'] = manifest_content
-                logger.debug(f"Extracted PROJECT-MANIFEST.md from {repo_name}")
-        except Exception as e:
-            logger.debug(f"No PROJECT-MANIFEST.md found for {repo_name}: {str(e)}")
+        return self._extract_repo_metadata_rest(repo_name, username)
+    
+    def _extract_repo_metadata_rest(self, repo_name, username):
+        """Extract structured metadata from special files using REST calls."""
+        def fetch_special_file(path):
+            try:
+                logger.debug(f"Checking for {path} in {username}/{repo_name}")
+                return self.get_file_content(username, repo_name, path)
+            except Exception as e:
+                logger.debug(f"No {path} found for {repo_name}: {str(e)}")
+                return None
         
-        # Check for SKILLS-INDEX.md
+        # List the root tree once so only files that exist are fetched
+        present = set(SPECIAL_FILES)
         try:
-            skills_content = self.get_file_content(username, repo_name, 'SKILLS-INDEX.md')
-            if skills_content:
-                metadata['skills'] = skills_content
-                logger.debug(f"Extracted SKILLS-INDEX.md from {repo_name}")
+            tree = self.make_request('GET', f"repos/{username}/{repo_name}/git/trees/HEAD")
+            if isinstance(tree, dict) and isinstance(tree.get('tree'), list):
+                present &= {entry.get('path') for entry in tree['tree'] if entry.get('type') == 'blob'}
         except Exception as e:
-            logger.debug(f"No SKILLS-INDEX.md found for {repo_name}: {str(e)}")
+            logger.debug(f"Could not list tree for {repo_name}, probing all special files: {str(e)}")
+        
+        # Fetch the files that exist concurrently rather than one after another
+        paths = [path for path in SPECIAL_FILES if path in present]
+        contents = {}
+        if paths:
+            with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+                contents = dict(zip(paths, executor.map(fetch_special_file, paths)))
+        context_data, manifest_content, skills_content = (contents.get(path) for path in SPECIAL_FILES)
+        
+        return self.parse_repo_metadata(repo_name, context_data, manifest_content, skills_content)
+    
+    def parse_repo_metadata(self, repo_name, context_data=None, manifest_content=None, skills_content=None):
+        """Build the metadata dict from the raw contents of the special files."""
+        metadata = {}
+        
+        if context_data:
+            try:
+                metadata['context'] = orjson.loads(context_data)
+                logger.debug(f"Extracted .repo-context.json from {repo_name}")
+            except orjson.JSONDecodeError as e:
+                logger.warning(
+                    f"Invalid JSON in .repo-context.json for {repo_name}: {str(e)}; "
+                    f"body starts with {context_data[:200]!r}"
+                )
+        
+        if manifest_content:
+            metadata['manifest'] = manifest_content
+            logger.debug(f"Extracted PROJECT-MANIFEST.md from {repo_name}")
+        
+        if skills_content:
+            metadata['skills'] = skills_content
+            logger.debug(f"Extracted SKILLS-INDEX.md from {repo_name}")
         
         if metadata:
             logger.info(f"Extracted metadata from {len(metadata)} special files for {repo_name}")
             
         return metadata
+    
+    def graphql(self, query, variables=None):
+        """Run a GitHub GraphQL query and return its data payload."""
+        if not self.token:
+            raise ValueError("GitHub GraphQL API requires an authentication token")
+        
+        payload = {'query': query, 'variables': variables or {}}
+        result = self.make_request('POST', 'graphql', data=payload, use_cache=False)
+        
+        if not isinstance(result, dict) or result.get('data') is None:
+            message = (result.get('errors') or result.get('message')) if isinstance(result, dict) else result
+            raise Exception(f"GitHub GraphQL query failed: {message}")
+        
+        # Partial errors (e.g. a renamed repository) still return data for the rest
+        if result.get('errors'):
+            logger.warning(f"GitHub GraphQL query returned errors: {result['errors']}")
+            
+        return result['data']
+    
+    def get_repos_with_bundles(self, username=None):
+        """List repositories with their languages, README and metadata files via GraphQL."""
+        username = username or self.username
+        pairs = []
+        cursor = None
+        
+        while True:
+            data = self.graphql(PORTFOLIO_QUERY, {'login': username, 'first': GRAPHQL_PAGE_SIZE, 'after': cursor})
+            if not data.get('user'):
+                raise Exception(f"GitHub user not found: {username}")
+            
+            repositories = data['user']['repositories']
+            for node in repositories['nodes']:
+                # Same shape as a REST listing entry, so _process_repo handles both
+                repo = {
+                    'name': node['name'],
+                    'description': node.get('description'),
+                    'language': (node.get('primaryLanguage') or {}).get('name'),
+                    'topics': [topic['topic']['name'] for topic in (node.get('repositoryTopics') or {}).get('nodes', [])],
+                    'stargazers_count': node.get('stargazerCount', 0),
+                    'updated_at': node.get('updatedAt', ''),
+                    'html_url': node.get('url', ''),
+                    'fork': node.get('isFork', False),
+                    'size': node.get('diskUsage')
+                }
+                pairs.append((repo, node))
+            
+            page_info = repositories['pageInfo']
+            if not page_info['hasNextPage']:
+                break
+            cursor = page_info['endCursor']
+        
+        logger.info(f"Fetched {len(pairs)} repositories with details via GraphQL for {username}")
+        return pairs
+        
+    def _process_repo(self, repo, username, bundle=None):
+        """Fetch languages, README and metadata for a single repository."""
+        try:
+            repo_name = repo['name']
+            logger.info(f"Processing repository: {repo_name}")
+            
+            if not _needs_details(repo):
+                # Listing fields are enough; don't spend requests on forks or empty repositories
+                languages = [repo['language']] if repo.get('language') else []
+                readme_content = None
+                metadata = {}
+            elif bundle is not None:
+                # Everything was already fetched in the GraphQL listing
+                languages = [node['name'] for node in (bundle.get('languages') or {}).get('nodes', [])]
+                readme_content = _blob_text(bundle.get('readme')) or _blob_text(bundle.get('readme_lower'))
+                if bundle.get('readme') is None and bundle.get('readme_lower') is None:
+                    # Other README names (Readme.md, README.rst, ...) are only found by the REST endpoint
+                    try:
+                        readme_content = self.get_readme(username, repo_name, README_MAX_BYTES)
+                    except Exception as e:
+                        logger.warning(f"README fallback failed for {repo_name}: {str(e)}")
+                metadata = self.parse_repo_metadata(
+                    repo_name,
+                    _blob_text(bundle.get('context')),
+                    _blob_text(bundle.get('manifest')),
+                    _blob_text(bundle.get('skills'))
+                )
+            else:
+                # GraphQL is unavailable; languages, README and metadata are
+                # independent REST calls, so fetch them together
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    languages_future = executor.submit(self.get_repo_languages, username, repo_name)
+                    # Sections sit near the top, so skip the tail of large READMEs
+                    readme_future = executor.submit(self.get_readme, username, repo_name, README_MAX_BYTES)
+                    metadata_future = executor.submit(self._extract_repo_metadata_rest, repo_name, username)
+                    
+                    languages = languages_future.result()
+                    languages = list(languages.keys()) if languages else []
+                    readme_content = readme_future.result()
+                    metadata = metadata_future.result()
+            
+            # Extract readme sections
+            readme_sections = self.extract_readme_sections(readme_content) if readme_content else {}
+            
+            repo_info = {
+                'name': repo_name,
+                'description': repo.get('description', ''),
+                'language': repo.get('language', ''),
+                'languages': languages,
+                'topics': repo.get('topics', []),
+                'stars': repo.get('stargazers_count', 0),
+                'updated_at': repo.get('updated_at', ''),
+                'url': repo.get('html_url', ''),
+                'is_fork': repo.get('fork', False),
+                'readme_excerpt': readme_content[:1000] if readme_content else "",
+                'readme_sections': readme_sections,
+                'metadata': metadata
+            }
+            
+            logger.info(f"Successfully processed repository: {repo_name}")
+            return repo_info
+            
+        except Exception as e:
+            logger.error(f"Error processing repository {repo.get('name', 'unknown')}: {str(e)}")
+            return None
         
     def get_processed_repos(self, username=None):
         """Get processed repository data with all necessary details."""
@@ -376,49 +1053,37 @@ class GitHubClient:
             logger.info(f"Using cached processed repositories for {username}")
             return cached_data
         
-        # Get all repositories
-        all_repos = self.get_user_repos(username)
-        
-        # Process repositories to extract details
-        processed_repos = []
-        for repo in all_repos:
+        # Simultaneous portfolio queries after expiry build the list only once
+        return _single_flight(
+            cache_key,
+            lambda: self._build_processed_repos(username, cache_key),
+            lambda: self._get_from_cache(cache_key)
+        )
+    
+    def _build_processed_repos(self, username, cache_key):
+        """Fetch and process every repository, caching the result under cache_key."""
+        # One GraphQL query per page of repositories covers the listing and
+        # every per-repo detail; fall back to REST calls if it fails
+        repo_bundles = None
+        if self.token:
             try:
-                repo_name = repo['name']
-                logger.info(f"Processing repository: {repo_name}")
-                
-                # Get languages
-                languages = self.get_repo_languages(username, repo_name)
-                
-                # Get README
-                readme_content = self.get_readme(username, repo_name)
-                
-                # Extract readme sections
-                readme_sections = self.extract_readme_sections(readme_content) if readme_content else {}
-                
-                # Extract metadata
-                metadata = self.extract_repo_metadata(repo_name, username)
-                
-                repo_info = {
-                    'name': repo_name,
-                    'description': repo.get('description', ''),
-                    'language': repo.get('language', ''),
-                    'languages': list(languages.keys()) if languages else [],
-                    'topics': repo.get('topics', []),
-                    'stars': repo.get('stargazers_count', 0),
-                    'updated_at': repo.get('updated_at', ''),
-                    'url': repo.get('html_url', ''),
-                    'is_fork': repo.get('fork', False),
-                    'readme_excerpt': readme_content[:1000] if readme_content else "",
-                    'readme_sections': readme_sections,
-                    'metadata': metadata
-                }
-                
-                processed_repos.append(repo_info)
-                logger.info(f"Successfully processed repository: {repo_name}")
-                
+                repo_bundles = self.get_repos_with_bundles(username)
             except Exception as e:
-                logger.error(f"Error processing repository {repo.get('name', 'unknown')}: {str(e)}")
-                # Continue with next repository
+                logger.warning(f"GraphQL repository fetch failed, falling back to REST: {str(e)}")
+        
+        if repo_bundles is None:
+            repo_bundles = [(repo, None) for repo in self.get_user_repos(username)]
+        
+        # Process repositories concurrently; the work is dominated by network waits
+        processed_repos = []
+        if repo_bundles:
+            max_workers = min(MAX_REPO_WORKERS, len(repo_bundles))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(
+                    lambda pair: self._process_repo(pair[0], username, pair[1]),
+                    repo_bundles
+                )
+                processed_repos = [repo_info for repo_info in results if repo_info is not None]
         
         # Sort by updated_at date
         processed_repos.sort(key=lambda x: x.get('updated_at', ''), reverse=True)
@@ -429,42 +1094,51 @@ class GitHubClient:
             
         return processed_repos
     
-    def generate_enhanced_context(self, repos_data):
+    @staticmethod
+    def generate_enhanced_context(repos_data):
         """Generate rich context from structured repository data."""
         logger.info(f"Generating enhanced context from {len(repos_data)} repositories")
         context = []
         
         for repo in repos_data:
-            repo_context = f"Repository: {repo['name']}\n"
-            repo_context += f"Description: {repo['description']}\n"
+            # Look up optional fields once per repository
+            languages = repo['languages']
+            topics = repo.get('topics')
+            readme_sections = repo.get('readme_sections')
+            metadata = repo.get('metadata')
+            
+            # Collect fragments and join once instead of growing a string
+            parts = [
+                f"Repository: {repo['name']}\n",
+                f"Description: {repo['description']}\n"
+            ]
             
             # Add languages
-            if repo['languages']:
-                repo_context += f"Languages: {', '.join(repo['languages'])}\n"
+            if languages:
+                parts.append(f"Languages: {', '.join(languages)}\n")
             
             # Add topics
-            if repo.get('topics'):
-                repo_context += f"Topics: {', '.join(repo['topics'])}\n"
+            if topics:
+                parts.append(f"Topics: {', '.join(topics)}\n")
             
             # Add readme sections
-            if repo.get('readme_sections'):
-                for section_name, section_content in repo['readme_sections'].items():
-                    repo_context += f"\n{section_name.replace('_', ' ').title()}:\n{section_content[:500]}...\n"
+            if readme_sections:
+                for section_name, section_content in readme_sections.items():
+                    parts.append(f"\n{section_name.replace('_', ' ').title()}:\n{section_content[:500]}...\n")
             
             # Add metadata
-            if repo.get('metadata'):
-                repo_context += "\nMetadata:\n"
-                if 'context' in repo['metadata']:
-                    context_data = repo['metadata']['context']
-                    if isinstance(context_data, dict):
-                        for key, value in context_data.items():
-                            repo_context += f"- {key}: {value}\n"
+            if metadata:
+                parts.append("\nMetadata:\n")
+                context_data = metadata.get('context')
+                if isinstance(context_data, dict):
+                    for key, value in context_data.items():
+                        parts.append(f"- {key}: {value}\n")
                 
-                if 'skills' in repo['metadata']:
-                    skills_content = repo['metadata']['skills']
-                    repo_context += f"\nSkills: {skills_content[:300]}...\n"
+                skills_content = metadata.get('skills')
+                if skills_content is not None:
+                    parts.append(f"\nSkills: {skills_content[:300]}...\n")
             
-            context.append(repo_context)
+            context.append("".join(parts))
         
         final_context = "\n\n".join(context)
         logger.info(f"Generated enhanced context ({len(final_context)} chars)")